@@ -1,13 +1,17 @@
 from .load_data import DataLoader
+from .load_data import ExcelLoader
 from .load_data import AlfaLoader
 from .load_data import BpsLoader
 from .load_data import InstallmentLoader
 from .load_data import LizingLoader
+from .load_data import load_all_data
 
 __all__ = [
     'DataLoader',
+    'ExcelLoader',
     'AlfaLoader',
     'BpsLoader',
     'InstallmentLoader',
-    'LizingLoader'
+    'LizingLoader',
+    'load_all_data'
 ]
\ No newline at end of file
@@ -1,82 +1,241 @@
+import logging
+
 import pandas as pd
-from abc import ABC
+import polars as pl
+import pyarrow as pa
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from pyarrow import csv as pacsv
+
+try:
+    import duckdb
+except ImportError:
+    # duckdb is an optional accelerator; the loaders fall back to pyarrow without it
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+# Column mappings of each source, hoisted to module level as frozen constants so
+# every load reuses the same objects instead of rebuilding dicts and lists per call
+ALFA_RENAME_MAP = MappingProxyType({
+    "Phone": "phone_number",
+    "Date": "date",
+    "Identification number": "identify",
+})
+ALFA_OUTPUT_COLUMNS = ("date", "phone_number", "identify")
+
+BPS_RENAME_MAP = MappingProxyType({
+    "TEL": "phone_number",
+    "APLCTN_DT": "date",
+})
+BPS_SOURCE_COLUMNS = ('TEL', 'APLCTN_DT')
+BPS_OUTPUT_COLUMNS = ('date', 'phone_number')
+
+INSTALLMENT_RENAME_MAP = MappingProxyType({
+    "Действующий абонентский номер": 'phone_number',
+    "Дата продажи": 'date',
+})
+INSTALLMENT_OUTPUT_COLUMNS = ('date', 'phone_number')
+
+LIZING_RENAME_MAP = MappingProxyType({
+    "Мобильный телефон": 'phone_number',
+    "Дата заключения": 'date',
+})
+LIZING_OUTPUT_COLUMNS = ('date', 'phone_number')
+
+
+def _read_excel_readonly(source_path, sheet_name: str, columns: list) -> pd.DataFrame:
+    """
+    Read selected columns of a worksheet with openpyxl in read-only mode.
+
+    Fallback for environments without python-calamine. read_only=True streams the
+    sheet row by row instead of building the full in-memory workbook model, which
+    keeps memory flat on large files; only the requested columns are kept.
+
+    Parameters:
+        source_path: Path of the Excel workbook.
+        sheet_name (str): Name of the worksheet to read.
+        columns (list): Header names of the columns to keep, header row assumed first.
+
+    Returns:
+        pd.DataFrame: The projected worksheet contents.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source_path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows)
+        indices = [header.index(column) for column in columns]
+        records = [[row[index] for index in indices] for row in rows]
+    finally:
+        workbook.close()
+
+    return pd.DataFrame.from_records(records, columns=columns)
 
 
 class DataLoader(ABC):
-    def __init__(self, **paths):
+    def __init__(self, cache_dir=None, **paths):
+        self.cache_dir = cache_dir
         self.paths = paths
 
-    @staticmethod
-    def _read_data(file_path: str):
-        pass
-
-    @staticmethod
-    def _clean_data(df: pd.DataFrame) -> pd.DataFrame:
-        pass
+    @abstractmethod
+    def _read_data(self, *args, **kwargs):
+        """Read the raw source data into a frame."""
 
+    @abstractmethod
+    def _clean_data(self, *args, **kwargs):
+        """Rename and project the raw frame into the cleaned schema."""
 
-class AlfaLoader(DataLoader):
-    @staticmethod
-    def _clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    def _excel_to_parquet_cache(self, source_key: str, sheet_name: str, columns: list) -> Path:
         """
-        Clean Alfa Data Function
+        Convert an Excel source to a Parquet cache file and return the cache path.
 
-        This function takes a pandas DataFrame containing Alfa data and performs the following steps:
-        1. Renames the columns 'Phone', 'Date', and 'Identification number' to 'phone_number', 'date', and 'identify',
-           respectively.
-        2. Selects only the 'date', 'phone_number', and 'identify' columns from the DataFrame.
+        Excel parsing is by far the slowest step of the pipeline, so the workbook is
+        parsed once and the projected columns are written next to it (or into
+        ``cache_dir``) as zstd-compressed Parquet. Subsequent loads scan the Parquet
+        file instead. The cache is refreshed whenever the source file is newer than
+        the cached copy.
 
         Parameters:
-            df (pd.DataFrame): The input DataFrame containing Alfa data.
+            source_key (str): Key of the source file in self.paths.
+            sheet_name (str): Name of the worksheet to read on a cache miss.
+            columns (list): Columns to keep; only these are parsed and cached.
 
         Returns:
-            pd.DataFrame: A cleaned DataFrame with columns 'date', 'phone_number', and 'identify'.
+            Path: The path of the up-to-date Parquet cache file.
         """
-
-        # Step 1: Rename the columns
-        df_cleaned = df.rename(
-            columns={
-                "Phone": "phone_number",
-                "Date": "date",
-                "Identification number": "identify",
-            }
+        source_path = Path(self.paths[source_key])
+        cache_dir = Path(self.cache_dir) if self.cache_dir is not None else source_path.parent
+        cache_path = cache_dir / f"{source_path.stem}.parquet"
+
+        # Re-parse the workbook only when the cache is missing or stale; calamine
+        # parses xlsx several times faster than openpyxl
+        if not cache_path.exists() or cache_path.stat().st_mtime < source_path.stat().st_mtime:
+            try:
+                df = pd.read_excel(
+                    source_path, sheet_name=sheet_name, header=0, usecols=columns, engine='calamine'
+                )
+            except ImportError:
+                # python-calamine is not installed; stream the sheet with openpyxl instead
+                df = _read_excel_readonly(source_path, sheet_name, columns)
+            df.to_parquet(cache_path, engine='pyarrow', compression='zstd')
+
+        return cache_path
+
+
+class ExcelLoader(DataLoader):
+    """
+    Shared implementation for the Excel-backed sources.
+
+    The three Excel sources only differ in their path key, worksheet name and
+    column mapping, so subclasses declare those as class attributes and inherit
+    the whole load/clean flow. The workbook is converted once into a Parquet
+    cache and every load scans the cache lazily.
+
+    Class attributes to define in subclasses:
+        source_key (str): Key of the source file in self.paths.
+        sheet_name (str): Name of the worksheet to read on a cache miss.
+        rename_map (dict): Mapping of source column names to cleaned names.
+        output_columns (list): Cleaned column names in output order.
+    """
+
+    source_key: str
+    sheet_name: str
+    rename_map: dict
+    output_columns: list
+
+    def _read_data(self) -> pl.LazyFrame:
+        # Scan the Parquet cache of the workbook (converted on first load)
+        cache_path = self._excel_to_parquet_cache(
+            self.source_key, self.sheet_name, list(self.rename_map)
         )
+        return pl.scan_parquet(cache_path)
 
-        # Step 2: Select the desired columns
-        df_cleaned = df_cleaned.loc[:, ["date", "phone_number", "identify"]]
+    def _clean_data(self, df: pl.LazyFrame) -> pl.LazyFrame:
+        # Step 1: Rename the columns
+        df_cleaned = df.rename(dict(self.rename_map))
+
+        # Step 2: Select the desired columns, normalizing the phone number to a
+        # Utf8 column so pandas receives it Arrow-backed instead of as objects.
+        # A single blank cell makes Excel-sourced numeric columns materialize as
+        # float, and stringifying a float yields '375291234567.0' — a join key
+        # that never matches the digit-only BPS strings — so float columns go
+        # through Int64 first to keep only the digits.
+        phone_expr = pl.col('phone_number')
+        if df_cleaned.collect_schema()['phone_number'].is_float():
+            phone_expr = phone_expr.cast(pl.Int64)
+        phone_expr = phone_expr.cast(pl.String)
+
+        df_cleaned = df_cleaned.select([
+            phone_expr if column == 'phone_number' else pl.col(column)
+            for column in self.output_columns
+        ])
 
         return df_cleaned
 
-    def load_alfa_data(self):
+    def load_data(self, lazy: bool = False):
         """
-        Loads and cleans the Alfa data from an Excel file.
+        Loads and cleans the source data from its Excel file.
 
-        This method reads the Alfa data from the specified Excel file and processes it
-        to clean any inconsistencies or missing values. The cleaned data is returned as a pandas DataFrame.
+        The Excel workbook is parsed once into a Parquet cache; this and later loads
+        scan the cache, which is columnar, compressed and projects at the reader level.
+
+        Parameters:
+            lazy (bool): If True, return a pl.LazyFrame so the caller can fuse further
+                         operations and defer materialization until collect().
 
         Returns:
-            pd.DataFrame or None: The cleaned Alfa data as a pandas DataFrame if successful,
-                                  otherwise returns None if an error occurs during loading or cleaning.
+            pd.DataFrame, pl.LazyFrame or None: The cleaned data if successful,
+                                                otherwise None if an error occurs during loading or cleaning.
         """
+        label = self.source_key.capitalize()
+        logger.debug("Loading %s data...", label)
         try:
-            # Load Alfa data from the Excel file
-            print("Loading Alfa data...")
-            alfa_data = pd.read_excel(self.paths["alfa"], sheet_name="Sheet1", header=0)
-            print("Alfa data loaded successfully.")
-
-            # Clean Alfa data
-            print("Cleaning Alfa data...")
-            cleaned_alfa_data = self._clean_data(alfa_data)
-            print("Alfa data cleaned successfully.")
-
-            return cleaned_alfa_data
-        except Exception as e:
-            # If any exception occurs during loading or cleaning, catch it and print an error message
-            print(f"Error while loading or cleaning Alfa data: {e}")
+            frame = self._read_data()
+        except FileNotFoundError as e:
+            logger.error("%s source file not found: %s", label, e)
             return None
+        except (ValueError, KeyError) as e:
+            # A missing worksheet or missing source columns surface as ValueError
+            # from calamine but as KeyError from the openpyxl fallback
+            logger.error("Could not read %s data: %s", label, e)
+            return None
+        logger.debug("Data loaded successfully.")
+
+        logger.debug("Cleaning %s data...", label)
+        cleaned_frame = self._clean_data(frame)
+        logger.debug("Data cleaned successfully.")
+
+        if lazy:
+            return cleaned_frame
+        return cleaned_frame.collect().to_pandas(use_pyarrow_extension_array=True)
+
+
+class AlfaLoader(ExcelLoader):
+    source_key = 'alfa'
+    sheet_name = "Sheet1"
+    rename_map = ALFA_RENAME_MAP
+    output_columns = ALFA_OUTPUT_COLUMNS
+
+    def load_alfa_data(self, lazy: bool = False):
+        """
+        Loads and cleans the Alfa data from an Excel file.
+
+        Returns:
+            pd.DataFrame, pl.LazyFrame or None: The cleaned Alfa data if successful,
+                                                otherwise None if an error occurs during loading or cleaning.
+        """
+        return self.load_data(lazy=lazy)
 
 
 class BpsLoader(DataLoader):
+    # Format of the APLCTN_DT column in the BPS extract; passing it explicitly lets
+    # the reader parse dates in one vectorized pass instead of inferring per value
+    DATE_FORMAT = '%Y-%m-%d'
+
     @staticmethod
     def _read_data(csv_file_path: str) -> pd.DataFrame:
         """
@@ -94,147 +253,165 @@ class BpsLoader(DataLoader):
             The 'APLCTN_DT' column should contain date values in string format.
             The 'PD' column should contain integer values, and it won't be included in the DataFrame.
         """
-        # Define the columns to be used in the DataFrame
-        columns_to_use = ['TEL', 'APLCTN_DT']
-
-        # Specify the data types for each column
-        data_types = {
-            "TEL": 'int64',
-            "APLCTN_DT": 'string',
-        }
-
-        # Specify the 'APLCTN_DT' column as a date to be parsed during reading
-        parse_dates = ['APLCTN_DT']
+        if duckdb is not None:
+            # DuckDB plans the projection into its CSV scanner and returns Arrow,
+            # so only the two selected columns ever leave the C++ reader. The path is
+            # bound as a parameter, and the date format is pinned so this path parses
+            # APLCTN_DT exactly like the pyarrow fallback below.
+            query = (
+                "SELECT CAST(TEL AS VARCHAR) AS TEL, CAST(APLCTN_DT AS TIMESTAMP) AS APLCTN_DT "
+                f"FROM read_csv_auto(?, delim=';', timestampformat='{BpsLoader.DATE_FORMAT}')"
+            )
+            try:
+                # fetch_arrow_table materializes a pyarrow.Table on every duckdb
+                # version; .arrow() started returning a RecordBatchReader in 1.3
+                table = duckdb.execute(query, [str(csv_file_path)]).fetch_arrow_table()
+            except duckdb.IOException as e:
+                # Translate to the exceptions load_bps_data handles, matching the
+                # pyarrow path's behaviour
+                raise FileNotFoundError(str(e)) from e
+            except duckdb.Error as e:
+                raise ValueError(str(e)) from e
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+        # Stream the CSV through Arrow's C++ parser batch by batch, keeping only the
+        # needed columns and typing them at the reader level. TEL is typed as a string
+        # here so the phone number never exists as integers needing a later conversion
+        # pass. Unlike read_csv, the streaming reader only keeps one block in flight
+        # while parsing, so peak memory stays close to the size of the kept columns.
+        reader = pacsv.open_csv(
+            csv_file_path,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            parse_options=pacsv.ParseOptions(delimiter=';'),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(BPS_SOURCE_COLUMNS),
+                column_types={'TEL': pa.string(), 'APLCTN_DT': pa.timestamp('ns')},
+                timestamp_parsers=[BpsLoader.DATE_FORMAT],
+            ),
+        )
+        table = reader.read_all()
 
-        # Read the CSV file into a DataFrame with the specified parameters
-        df = pd.read_csv(csv_file_path, sep=';', usecols=columns_to_use, dtype=data_types, parse_dates=parse_dates,
-                         low_memory=False)
-
-        return df
+        # Hand the Arrow table to pandas without copying the column buffers
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
 
     @staticmethod
     def _clean_data(input_df: pd.DataFrame) -> pd.DataFrame:
-        # Create a copy of the input DataFrame to avoid modifying the original data
-        df = input_df.copy()
-
-        # Rename columns using more descriptive names
-        renamed_columns = {
-            "TEL": "phone_number",
-            "APLCTN_DT": "date",
-            # Add more column renames if needed
-        }
-        df.rename(columns=renamed_columns, inplace=True)
+        # Rename columns using more descriptive names; under copy-on-write the
+        # rename shares the column buffers without an explicit copy keyword
+        df = input_df.rename(columns=BPS_RENAME_MAP)
 
-        # Select the desired columns in the desired order
-        selected_columns = ["date", "phone_number"]
-        df = df[selected_columns]
+        # Select the desired columns in the desired order; phone_number is already
+        # an Arrow-backed string column straight from the reader
+        df = df[list(BPS_OUTPUT_COLUMNS)]
 
         return df
 
-    def load_bps_data(self):
+    def load_bps_data(self, lazy: bool = False):
         """
         Method to load and clean BPS data from a CSV file.
 
+        Parameters:
+            lazy (bool): If True, return a pl.LazyFrame over the CSV so further
+                         operations fuse into the scan and nothing is materialized
+                         until collect().
+
         Returns:
-            pandas.DataFrame or None: A DataFrame containing the cleaned BPS data,
+            pandas.DataFrame, pl.LazyFrame or None: The cleaned BPS data,
             or None if an error occurred during data processing.
         """
+        logger.debug("Loading BPS data...")
+        if lazy:
+            # Defer the whole read: the scan only materializes the two cleaned
+            # columns, and only when the caller collects
+            return (
+                pl.scan_csv(self.paths['bps'], separator=';')
+                .select([
+                    pl.col('APLCTN_DT')
+                    .str.to_datetime(BpsLoader.DATE_FORMAT)
+                    .alias('date'),
+                    pl.col('TEL').cast(pl.String).alias('phone_number'),
+                ])
+            )
+
+        # Read data from CSV file
         try:
-            print("Loading BPS data...")
-            # Read data from CSV file
             data_df = self._read_data(csv_file_path=self.paths['bps'])
-            print("Data loaded successfully.")
-
-            print("Cleaning BPS data...")
-            # Clean the data
-            cleaned_df = self._clean_data(input_df=data_df)
-            print("Data cleaned successfully.")
-
-            # Make a copy of the cleaned data to avoid modifying the original DataFrame
-            bps_train_df = cleaned_df.copy()
-
-            return bps_train_df
-
-        except Exception as e:
-            print("An error occurred during data processing:", e)
+        except FileNotFoundError as e:
+            logger.error("BPS source file not found: %s", e)
             return None
+        except (ValueError, KeyError) as e:
+            # Malformed rows raise ArrowInvalid (a ValueError subclass); a CSV
+            # missing TEL or APLCTN_DT raises ArrowKeyError (a KeyError subclass)
+            logger.error("Could not read BPS data: %s", e)
+            return None
+        logger.debug("Data loaded successfully.")
 
-class InstallmentLoader(DataLoader):
-    @staticmethod
-    def _clean_data(input_df: pd.DataFrame) -> pd.DataFrame:
-        """
-        Clean and select relevant columns from the input DataFrame.
-
-        Parameters:
-            input_df (pd.DataFrame): The input DataFrame with the following columns:
-                - "Действующий абонентский номер" (str): The phone number of the subscriber.
-                - "Дата продажи" (str or datetime): The date of the sale.
-
-        Returns:
-            pd.DataFrame: A new DataFrame with the cleaned data containing the following columns:
-                - "date" (str or datetime): The date of the sale.
-                - "phone_number" (str): The phone number of the subscriber.
-        """
-        cleaned_df = input_df.rename(columns={
-            "Действующий абонентский номер": 'phone_number',
-            "Дата продажи": 'date',
-        })
+        logger.debug("Cleaning BPS data...")
+        # Clean the data; rename and column selection already return a new frame,
+        # so no defensive copy is needed
+        cleaned_df = self._clean_data(input_df=data_df)
+        logger.debug("Data cleaned successfully.")
 
-        cleaned_df = cleaned_df.loc[:, ['date', 'phone_number']]
         return cleaned_df
 
-    def load_installment_data(self):
+class InstallmentLoader(ExcelLoader):
+    source_key = 'installment'
+    sheet_name = "Лист1"
+    rename_map = INSTALLMENT_RENAME_MAP
+    output_columns = INSTALLMENT_OUTPUT_COLUMNS
+
+    def load_installment_data(self, lazy: bool = False):
         """
         Loads installment data from an Excel file and performs data cleaning.
 
         Returns:
-            pd.DataFrame or None: A cleaned DataFrame containing 'Действующий абонентский номер'
-                                  and 'Дата продажи' columns, or None if an error occurs during processing.
+            pd.DataFrame, pl.LazyFrame or None: A cleaned frame with 'date' and 'phone_number'
+                                                columns, or None if an error occurs during processing.
         """
-        try:
-            print("Loading Installment data...")
-            # Load the installment data from the Excel file into a DataFrame
-            new_data = pd.read_excel(self.paths['installment'], sheet_name="Лист1", header=0)
-            # Keep only the 'Действующий абонентский номер' and 'Дата продажи' columns
-            new_data = new_data[['Действующий абонентский номер', 'Дата продажи']]
-            print("Data loaded successfully.")
-
-            print("Cleaning Lizing data...")
-            # Clean the data using the internal _clean_data method
-            train_df_installment = self._clean_data(new_data)
-            print("Data cleaned successfully.")
-
-            return train_df_installment
-        except Exception as e:
-            # If an error occurs during data processing, print the error message and return None
-            print("An error occurred during data processing:", e)
-            return None
-
-class LizingLoader(DataLoader):
-    @staticmethod
-    def _clean_data(df: pd.DataFrame) -> pd.DataFrame:
-        train_df = df.rename(columns={
-            "Мобильный телефон": 'phone_number',
-            "Дата заключения": 'date',
-        })
-
-        train_df = train_df.loc[:, ['date', 'phone_number']]
-        return train_df
-
-    def load_lizing_data(self):
-        try:
-            print("Loading Lizing data...")
-            # Load the installment data from the Excel file into a DataFrame
-            new_data = pd.read_excel(self.paths['lizing'], sheet_name="Sheet1", header=0)
-            print("Data loaded successfully.")
-
-            print("Cleaning Lizing data...")
-            # Clean the data using the internal _clean_data method
-            train_df_lizing = self._clean_data(new_data)
-            print("Data cleaned successfully.")
-
-            return train_df_lizing
-        except Exception as e:
-            # If an error occurs during data processing, print the error message and return None
-            print("An error occurred during data processing:", e)
-            return None
+        return self.load_data(lazy=lazy)
+
+class LizingLoader(ExcelLoader):
+    source_key = 'lizing'
+    sheet_name = "Sheet1"
+    rename_map = LIZING_RENAME_MAP
+    output_columns = LIZING_OUTPUT_COLUMNS
+
+    def load_lizing_data(self, lazy: bool = False):
+        return self.load_data(lazy=lazy)
+
+
+def load_all_data(cache_dir=None, lazy: bool = False, **paths) -> dict:
+    """
+    Load every configured source concurrently and return the results by name.
+
+    The four loaders are independent and spend most of their time in file I/O and
+    in Arrow/Polars parsing code that releases the GIL, so running them in a thread
+    pool overlaps the reads instead of paying for them back to back.
+
+    Parameters:
+        cache_dir: Optional directory for the Parquet caches of the Excel sources.
+        lazy (bool): If True, every loader returns a pl.LazyFrame; the caller can
+                     then concat/join the sources and collect once, letting Polars
+                     fuse the per-source scans into a single query plan.
+        **paths: Source paths by name; any subset of 'alfa', 'bps', 'installment'
+                 and 'lizing'. Only the sources passed in are loaded.
+
+    Returns:
+        dict: A mapping of source name to its cleaned frame (or None if that
+              loader failed).
+    """
+    jobs = {}
+    if 'alfa' in paths:
+        jobs['alfa'] = AlfaLoader(cache_dir=cache_dir, alfa=paths['alfa']).load_alfa_data
+    if 'bps' in paths:
+        jobs['bps'] = BpsLoader(bps=paths['bps']).load_bps_data
+    if 'installment' in paths:
+        jobs['installment'] = InstallmentLoader(
+            cache_dir=cache_dir, installment=paths['installment']
+        ).load_installment_data
+    if 'lizing' in paths:
+        jobs['lizing'] = LizingLoader(cache_dir=cache_dir, lizing=paths['lizing']).load_lizing_data
+
+    with ThreadPoolExecutor(max_workers=len(jobs) or 1) as executor:
+        futures = {name: executor.submit(job, lazy=lazy) for name, job in jobs.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,28 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("polars")
+pytest.importorskip("pyarrow")
+duckdb = pytest.importorskip("duckdb")
+
+from mts.dataset import BpsLoader
+
+
+def test_load_bps_data_via_duckdb(tmp_path):
+    # Regression check for the DuckDB branch of BpsLoader._read_data: with duckdb
+    # importable the result must be materialized as a pyarrow.Table (on duckdb >= 1.3
+    # .arrow() returns a RecordBatchReader, which has no to_pandas)
+    csv_path = tmp_path / "bps.csv"
+    csv_path.write_text("TEL;APLCTN_DT;PD\n375291234567;2024-01-31;1\n")
+
+    df = BpsLoader(bps=str(csv_path)).load_bps_data()
+
+    assert df is not None
+    assert list(df.columns) == ["date", "phone_number"]
+    assert df["phone_number"].tolist() == ["375291234567"]
+    assert pd.Timestamp(df["date"].iloc[0]) == pd.Timestamp("2024-01-31")
+
+
+def test_load_bps_data_missing_file_returns_none(tmp_path):
+    # A missing source file must log and return None on the DuckDB path too
+    assert BpsLoader(bps=str(tmp_path / "missing.csv")).load_bps_data() is None